@@ -8,37 +8,399 @@ Dataset: HLS Sentinel-2 Multi-spectral Instrument Surface Reflectance Daily Glob
 Short Name: HLSS30
 """
 
-import earthaccess
 import os
-from datetime import datetime
-from typing import List, Tuple, Optional, Dict
+import gzip
+import hashlib
+import json
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Tuple, Optional, Dict, Union
 import argparse
+import sys
 from dotenv import load_dotenv
 import re
-from collections import defaultdict
+from collections import OrderedDict
 import logging
 
-# Load environment variables from .env file
-load_dotenv()
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, cache still works single-process
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:  # optional: search cache falls back to gzip
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_dir() -> Optional[str]:
+    """
+    Shared, content-addressed store for granule files (HLS_CACHE, default ~/.cache/hls).
+    
+    None when HLS_CACHE is set to an empty string: nothing is cached and files are
+    downloaded straight into their granule folders.
+    """
+    cache_dir = os.getenv('HLS_CACHE', '~/.cache/hls')
+    return os.path.expanduser(cache_dir) if cache_dir else None
+
+
+# Cached granule files that no granule folder links to any more are removed once
+# they are this old (seconds), so the cache only holds bytes shared with a project
+CACHE_UNLINKED_TTL = 24 * 3600
+
+
+# Cached CMR search results are reused for this long (seconds); searches whose date
+# range ended more than SEARCH_CACHE_SETTLED_DAYS ago no longer change and never expire
+SEARCH_CACHE_TTL = 24 * 3600
+SEARCH_CACHE_SETTLED_DAYS = 30
+
+# CMR caps a search page at 2000 granules; auto-download asks for small pages so the
+# first usable granule arrives (and its download starts) without the rest of the search
+CMR_MAX_PAGE_SIZE = 2000
+AUTO_DOWNLOAD_PAGE_SIZE = 10
+
+# LP DAAC / USGS ask clients to keep at most 5 concurrent connections
+MAX_CONCURRENT_DOWNLOADS = 5
+
+
+def _max_concurrent_downloads() -> int:
+    """Concurrent file transfers (HLS_MAX_CONCURRENT_DOWNLOADS, default MAX_CONCURRENT_DOWNLOADS)."""
+    try:
+        return max(1, int(os.getenv('HLS_MAX_CONCURRENT_DOWNLOADS', MAX_CONCURRENT_DOWNLOADS)))
+    except ValueError:
+        logger.warning("Ignoring invalid HLS_MAX_CONCURRENT_DOWNLOADS, "
+                       f"using {MAX_CONCURRENT_DOWNLOADS}")
+        return MAX_CONCURRENT_DOWNLOADS
+
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+# HLS file names are <granule id>.<band>.tif, e.g. HLS.S30.T42UXB.2025188T061639.v2.0.B11.tif
+GRANULE_ID_RE = re.compile(r'HLS\.[LS]30\.T[A-Z0-9]+\.\d+T\d+\.v\d+\.\d+')
+# Trailing band / mask / angle identifier of a file name (B02, B8A, Fmask, VAA, ...)
+BAND_ID_RE = re.compile(r'B\d{1,2}A?|Fmask|V[AZ]A|S[AZ]A')
+
+
+def _basename(url: str) -> str:
+    """File name at the end of a URL or path (scans from the end, no full split)."""
+    return url.rsplit('/', 1)[-1]
+
+
+def _fallback_granule_id(result) -> str:
+    """
+    Stable ID for a result with no usable name (hash() is salted per process).
+    
+    Hashes the CMR concept-id, or else the UMM record as sorted JSON. Never str(result):
+    DataGranule.__repr__ indexes fields that exactly these malformed records may lack.
+    """
+    try:
+        key = (result.get('meta', {}).get('concept-id')
+               or json.dumps(result.get('umm', {}), sort_keys=True, default=str))
+    except Exception:
+        # Not a CMR record at all: nothing stable to go by, but this must not raise
+        key = object.__repr__(result)
+    digest = hashlib.blake2b(key.encode(), digest_size=4).hexdigest()
+    return f"unknown_granule_{digest}"
+
+
+def _granule_id_from_filename(filename: str) -> str:
+    """Granule ID of an HLS file name: everything except the band and extension."""
+    match = GRANULE_ID_RE.search(filename)
+    if match:
+        return match.group(0)
+    
+    # Non-standard names: drop the .tif extension and a trailing band/mask identifier
+    if filename.endswith('.tif'):
+        filename = filename[:-4]
+    head, _, last_part = filename.rpartition('.')
+    if head and BAND_ID_RE.fullmatch(last_part):
+        return head
+    return filename
+
+
+def _search_cache_ttl(temporal) -> Optional[float]:
+    """Lifetime of a cached search for the given (start, end) range; None means forever."""
+    try:
+        end = datetime.strptime(str(temporal[1])[:10], '%Y-%m-%d')
+    except (TypeError, ValueError, IndexError):
+        return SEARCH_CACHE_TTL
+    if end < datetime.now() - timedelta(days=SEARCH_CACHE_SETTLED_DAYS):
+        return None
+    return SEARCH_CACHE_TTL
+
+
+# In-process layer over the disk cache, shared by every downloader in the process
+# (serve mode, example_usage.py); least recently used searches are dropped first
+SEARCH_MEMO_SIZE = 32
+_search_memo: "OrderedDict[str, Tuple[float, list]]" = OrderedDict()
+_search_memo_lock = threading.Lock()
+
+
+def _memo_get(key: str, ttl: Optional[float]) -> Optional[list]:
+    """Search results remembered in this process, if still within ttl."""
+    with _search_memo_lock:
+        entry = _search_memo.get(key)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if ttl is not None and time.time() - stored_at >= ttl:
+            del _search_memo[key]
+            return None
+        _search_memo.move_to_end(key)
+        return results
+
+
+def _memo_put(key: str, results: list, stored_at: Optional[float] = None) -> None:
+    """Remember search results in this process, evicting the oldest beyond SEARCH_MEMO_SIZE."""
+    with _search_memo_lock:
+        _search_memo[key] = (time.time() if stored_at is None else stored_at, results)
+        _search_memo.move_to_end(key)
+        while len(_search_memo) > SEARCH_MEMO_SIZE:
+            _search_memo.popitem(last=False)
+
+
+def _search_cache_path(key: str) -> Optional[str]:
+    """Path of a compressed search-metadata entry inside the cache directory (None if caching is off)."""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    suffix = '.json.zst' if zstandard is not None else '.json.gz'
+    return os.path.join(cache_dir, 'search', key + suffix)
+
+
+def _write_metadata(path: str, obj) -> None:
+    """Write obj to path as compressed JSON (zstd or gzip, chosen by suffix), atomically."""
+    data = json.dumps(obj, separators=(',', ':')).encode()
+    if path.endswith('.zst'):
+        data = zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        data = gzip.compress(data)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read_metadata(path: str):
+    """Inverse of _write_metadata."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.endswith('.zst'):
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def _granules_to_json(results: list) -> List[dict]:
+    """Plain CMR records of earthaccess search results, for the search cache."""
+    return [{'item': dict(result), 'cloud_hosted': bool(getattr(result, 'cloud_hosted', False))}
+            for result in results]
+
+
+def _granules_from_json(entries: List[dict]) -> list:
+    """Inverse of _granules_to_json: rebuild the earthaccess.DataGranule objects."""
+    import earthaccess
+    
+    return [earthaccess.DataGranule(entry['item'], cloud_hosted=entry['cloud_hosted'])
+            for entry in entries]
+
+
+@contextmanager
+def _file_lock(lock_path: str, blocking: bool = True):
+    """
+    Hold an exclusive advisory lock on a sidecar lockfile, removed again on release.
+    
+    Yields whether the lock was acquired, which is always True when blocking.
+    """
+    while True:
+        lock_file = open(lock_path, 'a')
+        if fcntl is None:
+            break
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            yield False
+            return
+        # The previous holder may have removed the lockfile while we waited for it:
+        # only a lock on the file currently at lock_path counts
+        try:
+            if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(lock_path)):
+                break
+        except FileNotFoundError:
+            pass
+        lock_file.close()
+    try:
+        yield True
+    finally:
+        # Remove while still locked, so nobody can lock this file after it is released
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+        lock_file.close()
+
+
+def _drop_page_cache(file: Union[str, int]) -> None:
+    """Ask the kernel to evict a freshly written file (path or open fd) from the page cache.
+    
+    Downloaded granules are read once, later, by rasterio/GDAL with their own
+    buffers; keeping them cached only evicts hotter data on small-RAM nodes.
+    """
+    if not hasattr(os, 'posix_fadvise'):  # macOS / Windows
+        return
+    fd = os.open(file, os.O_RDONLY) if isinstance(file, str) else file
+    try:
+        # DONTNEED skips dirty pages, so write the data back first
+        os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        if fd is not file:
+            os.close(fd)
+
+
+def _same_filesystem(path: str, other: str) -> bool:
+    """Whether two existing paths are on the same filesystem (so they can be hardlinked)."""
+    return os.stat(path).st_dev == os.stat(other).st_dev
+
+
+def _link_into(src: str, dest_dir: str) -> str:
+    """Hardlink a cached file into dest_dir, moving it there if hardlinks are not supported."""
+    dest = os.path.join(dest_dir, os.path.basename(src))
+    if os.path.exists(dest):
+        if os.path.samefile(src, dest):
+            return dest
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        # No hardlink support (e.g. some network filesystems): the cache gives the file
+        # up rather than keeping a second copy of its bytes
+        shutil.move(src, dest)
+    return dest
+
+
+def _prune_cache(cache_dir: str, max_age: float = CACHE_UNLINKED_TTL) -> int:
+    """
+    Remove cached granule files that no granule folder links to any more.
+    
+    A file whose only link is the cache entry itself, stored more than max_age seconds
+    ago, is deleted unless another worker holds its lock. Returns the number removed.
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(cache_dir):
+        if not entry.is_file(follow_symlinks=False) or entry.name.endswith(('.lock', '.part', '.tmp')):
+            continue
+        stat = entry.stat(follow_symlinks=False)
+        if stat.st_nlink > 1 or stat.st_mtime >= cutoff:
+            continue
+        with _file_lock(entry.path + '.lock', blocking=False) as locked:
+            # Checked again under the lock: it may have been linked in the meantime
+            if locked and os.path.exists(entry.path) and os.stat(entry.path).st_nlink == 1:
+                os.remove(entry.path)
+                removed += 1
+    return removed
+
+
+# Per-granule-folder record of completed downloads: {filename: {"size": bytes}}
+MANIFEST_NAME = '.manifest.json'
+
+
+def _read_manifest(folder: str) -> Dict[str, dict]:
+    """Load a folder's download manifest; missing or unreadable manifests are empty."""
+    try:
+        with open(os.path.join(folder, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(folder: str, entries: Dict[str, dict]) -> None:
+    """Atomically replace a folder's download manifest."""
+    path = os.path.join(folder, MANIFEST_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(entries, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
 
 # Add verbose logging support
 def setup_logging(verbose=False):
-    """Setup logging configuration."""
-    level = logging.DEBUG if verbose else logging.INFO
+    """Setup logging configuration (level from --verbose, else LOGLEVEL, default INFO)."""
+    level = logging.DEBUG if verbose else os.getenv('LOGLEVEL', 'INFO').upper()
+    # getLevelName maps known level names to their number; a typo must not stop the script
+    invalid_level = not isinstance(logging.getLevelName(level), int)
     logging.basicConfig(
-        level=level,
+        level=logging.INFO if invalid_level else level,
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
-    return logging.getLogger(__name__)
+    if invalid_level:
+        logger.warning(f"Ignoring invalid LOGLEVEL {level!r}, using INFO")
+    return logger
+
+
+# A range of granule numbers in the interactive selection, e.g. "1-3"
+SELECTION_RANGE_RE = re.compile(r'(\d+)\s*-\s*(\d+)')
+
+
+def _parse_selection(selection: str, count: int) -> List[int]:
+    """
+    Granule numbers chosen in the interactive menu, e.g. "1,3" or "1-3".
+    
+    Returns 1-based numbers in the order given, each at most once. Raises ValueError,
+    with a message for the user, for anything but numbers and ranges within 1..count.
+    """
+    numbers = []
+    for part in selection.split(','):
+        part = part.strip()
+        match = SELECTION_RANGE_RE.fullmatch(part)
+        if match:
+            start, end = int(match.group(1)), int(match.group(2))
+            if start > end:
+                raise ValueError(f"Invalid range {part!r}: the first number must not be larger")
+        else:
+            try:
+                start = end = int(part)
+            except ValueError:
+                raise ValueError(f"Invalid input {part!r}. Please enter numbers separated by commas "
+                                 "or press Enter for all") from None
+        if start < 1 or end > count:
+            raise ValueError(f"Invalid selection. Please enter numbers between 1 and {count}")
+        numbers.extend(range(start, end + 1))
+    # The same granule selected twice is downloaded once
+    return list(dict.fromkeys(numbers))
 
 
 class HLSDownloader:
     """Enhanced class to handle HLS Sentinel-2 data downloads from NASA Earthdata."""
     
-    def __init__(self, verbose=False):
-        """Initialize the downloader and authenticate with NASA Earthdata."""
+    def __init__(self, verbose=False, interactive_login=True):
+        """
+        Initialize the downloader and authenticate with NASA Earthdata.
+        
+        Args:
+            verbose: Enable debug logging
+            interactive_login: Prompt for credentials when neither the environment nor
+                ~/.netrc provides them; when False, fail instead (stdin may not be a terminal)
+        """
         self.logger = setup_logging(verbose)
         self.logger.info("🔄 Initializing HLS Downloader...")
+        # Imported here, not at module level: earthaccess (s3fs, aiobotocore, ...) and
+        # requests take a few hundred ms to import, which --help and argument errors
+        # should not pay
+        import earthaccess
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        load_dotenv()
         
         try:
             # Try to authenticate using environment variables first
@@ -46,17 +408,42 @@ class HLSDownloader:
             password = os.getenv('EARTHDATA_PASSWORD')
             
             if username and password:
+                # load_dotenv() has already exported them; earthaccess reads os.environ itself
                 self.logger.info("🔐 Using credentials from environment variables...")
-                # Set environment variables for earthaccess to use
-                os.environ['EARTHDATA_USERNAME'] = username
-                os.environ['EARTHDATA_PASSWORD'] = password
                 earthaccess.login(strategy='environment')
                 self.logger.info("✓ Successfully authenticated with NASA Earthdata (from .env)")
+            elif not interactive_login:
+                self.logger.info("🔐 No credentials found in environment, using ~/.netrc...")
+                auth = earthaccess.login(strategy='netrc')
+                if not auth.authenticated:
+                    raise RuntimeError("No usable credentials in ~/.netrc and interactive login is disabled")
+                self.logger.info("✓ Successfully authenticated with NASA Earthdata (from ~/.netrc)")
             else:
                 self.logger.info("🔐 No credentials found in environment, using interactive login...")
                 self.logger.info("   (Tip: Create a .env file with EARTHDATA_USERNAME and EARTHDATA_PASSWORD)")
                 earthaccess.login()
                 self.logger.info("✓ Successfully authenticated with NASA Earthdata (interactive)")
+            
+            # earthaccess probes the EC2 metadata endpoint at login; inside us-west-2 the
+            # granules can be read straight from the LP DAAC bucket instead of over HTTPS
+            self.in_region = getattr(earthaccess.__store__, 'in_region', False)
+            if self.in_region:
+                self.logger.info("☁️  Running in AWS us-west-2: using direct S3 access")
+            
+            # One pooled, authenticated session for every HEAD/GET, so TCP and TLS
+            # handshakes are reused across band files instead of paid per file
+            self._http = earthaccess.get_requests_https_session()
+            adapter = HTTPAdapter(
+                pool_connections=8,
+                # Enough kept-alive connections for every download worker
+                pool_maxsize=max(16, _max_concurrent_downloads()),
+                # LP DAAC / CloudFront answer overload with transient 502/503/504s
+                max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+            )
+            self._http.mount('https://', adapter)
+            self._http.mount('http://', adapter)
+            
+            self._granule_ids = {}
                 
         except Exception as e:
             self.logger.error(f"❌ Authentication failed: {e}")
@@ -65,6 +452,215 @@ class HLSDownloader:
             self.logger.error("Option 2: Use interactive login (script will prompt you)")
             raise
     
+    @staticmethod
+    def _bbox(sw_coords: Tuple[float, float], ne_coords: Tuple[float, float]) -> Tuple[float, float, float, float]:
+        """Bounding box (west, south, east, north) from two (lat, lon) corners in any order."""
+        # Round to ~0.1 m so the same area always yields the same search cache key
+        south, north = sorted((round(sw_coords[0], 6), round(ne_coords[0], 6)))
+        west, east = sorted((round(sw_coords[1], 6), round(ne_coords[1], 6)))
+        return (west, south, east, north)
+    
+    @staticmethod
+    def _temporal(date) -> Tuple[Tuple[str, str], Optional[set]]:
+        """
+        Search range for a date argument, plus the set of dates to keep (None keeps all).
+        
+        date is a YYYY-MM-DD date, a "start,end" range, or a list of dates. A list is
+        searched once over its whole span and filtered client-side afterwards, instead
+        of paying one CMR round-trip per date.
+        """
+        if isinstance(date, (list, tuple)):
+            dates = [d.strip() for d in date]
+            if not dates or not all(dates):
+                raise ValueError(f"Empty date in date list: {','.join(date)!r}")
+            for d in dates:
+                # Results are matched on their zero-padded YYYY-MM-DD acquisition date,
+                # so "2024-7-5" would silently match nothing
+                try:
+                    valid = datetime.strptime(d, '%Y-%m-%d').strftime('%Y-%m-%d') == d
+                except ValueError:
+                    valid = False
+                if not valid:
+                    raise ValueError(f"Invalid date in date list: {d!r} (expected YYYY-MM-DD)")
+            return (min(dates), max(dates)), set(dates)
+        start_date, sep, end_date = date.partition(',')
+        if sep:
+            # Date range provided
+            return (start_date.strip(), end_date.strip()), None
+        # Single date provided, search for that day
+        return (date, date), None
+    
+    @classmethod
+    def _search_window(cls, sw_coords, ne_coords, date) -> Tuple[Tuple[float, float, float, float], Tuple[str, str], Optional[set]]:
+        """Bounding box, temporal range and dates to keep for a search (see _bbox, _temporal)."""
+        return (cls._bbox(sw_coords, ne_coords),) + cls._temporal(date)
+    
+    @staticmethod
+    def _acquisition_date(result) -> Optional[str]:
+        """YYYY-MM-DD acquisition date of a search result, if its metadata has one."""
+        try:
+            return result['umm']['TemporalExtent']['RangeDateTime']['BeginningDateTime'][:10]
+        except (KeyError, TypeError):
+            return None
+    
+    def _cmr_pages(self, page_size: int, count: Optional[int], **params):
+        """
+        Yield (page, is_last) pairs of CMR granule search results (CMR-Search-After paging).
+        
+        Same request as earthaccess.search_data, minus its separate hits() round-trip,
+        and callers can stop before the remaining pages are requested. count=None
+        reads every page. is_last is known before the next page is requested; when the
+        final page turns out to be empty, the generator just ends.
+        """
+        import earthaccess
+        
+        query = earthaccess.granule_query().parameters(**params)
+        url = query._build_url()
+        headers = dict(query.headers or {})
+        page_size = max(1, min(page_size, CMR_MAX_PAGE_SIZE if count is None else count, CMR_MAX_PAGE_SIZE))
+        
+        fetched = 0
+        while count is None or fetched < count:
+            response = query.session.get(url, headers=headers, params={'page_size': page_size})
+            response.raise_for_status()
+            items = response.json()['items']
+            if count is not None:
+                items = items[:count - fetched]
+            if not items:
+                return
+            fetched += len(items)
+            cloud_hosted = query._is_cloud_hosted(items[0])
+            search_after = response.headers.get('cmr-search-after')
+            is_last = len(items) < page_size or not search_after or (count is not None and fetched >= count)
+            yield [earthaccess.DataGranule(item, cloud_hosted=cloud_hosted) for item in items], is_last
+            
+            if is_last:
+                return
+            headers['cmr-search-after'] = search_after
+    
+    def _iter_search_pages(self, page_size: int, **query):
+        """
+        Yield search results page by page, with an on-disk cache of the granule metadata.
+        
+        Entries are the CMR granule records as compressed JSON, keyed by the query
+        parameters; the records are verbose and shrink 5-10x, which also makes cold
+        reads faster. Only plain data is stored, so reading an entry (the directory may
+        be shared) never runs code and survives earthaccess upgrades.
+        A cache hit is yielded as a single page. Only searches that were read to the
+        end are cached; entries for date ranges that ended long ago never expire.
+        """
+        key = hashlib.sha256(json.dumps(query, sort_keys=True, default=str).encode()).hexdigest()
+        ttl = _search_cache_ttl(query.get('temporal'))
+        results = _memo_get(key, ttl)
+        if results is not None:
+            yield results
+            return
+        
+        cache_path = _search_cache_path(key)
+        if cache_path and os.path.exists(cache_path) and (ttl is None or time.time() - os.path.getmtime(cache_path) < ttl):
+            try:
+                results = _granules_from_json(_read_metadata(cache_path))
+                self.logger.info("♻️  Using cached search results")
+                # Age the in-process copy from when the disk entry was written
+                _memo_put(key, results, os.path.getmtime(cache_path))
+                yield results
+                return
+            except Exception as e:
+                # Unreadable or corrupt: search again and overwrite it
+                self.logger.debug(f"Ignoring unreadable search cache entry {cache_path}: {e}")
+        
+        results = []
+        stored = False
+        for page, is_last in self._cmr_pages(page_size, **query):
+            results.extend(page)
+            if is_last:
+                # Stored before the last page is handed out: a caller that is done with
+                # it may close this generator at the yield
+                self._store_search_results(key, cache_path, results)
+                stored = True
+            yield page
+        
+        if not stored:
+            self._store_search_results(key, cache_path, results)
+    
+    def _store_search_results(self, key: str, cache_path: Optional[str], results: list) -> None:
+        """Add complete search results to the in-process and on-disk search caches."""
+        if not results:
+            # Empty results are not cached: new acquisitions may still appear
+            return
+        _memo_put(key, results)
+        if cache_path is None:
+            return
+        try:
+            _write_metadata(cache_path, _granules_to_json(results))
+        except Exception as e:
+            self.logger.debug(f"Could not write search cache entry {cache_path}: {e}")
+    
+    def _iter_matching_pages(self, page_size: int, max_results: int, wanted_dates: Optional[set], **query):
+        """
+        Yield cached-search pages of results acquired on wanted_dates (all results when
+        None), until max_results results have been yielded.
+        
+        With wanted_dates the CMR query itself is not capped: results on other dates of
+        the searched span must not use up max_results, so pages are read until enough
+        matching results are found.
+        """
+        if wanted_dates:
+            query['count'] = None
+        pages = self._iter_search_pages(page_size, **query)
+        remaining = max_results
+        try:
+            for page in pages:
+                if wanted_dates:
+                    page = [result for result in page if self._acquisition_date(result) in wanted_dates]
+                page = page[:remaining]
+                remaining -= len(page)
+                if page:
+                    yield page
+                if remaining <= 0:
+                    return
+        finally:
+            pages.close()
+    
+    def _file_urls(self, results, seen_urls: Optional[set] = None) -> List[Tuple[str, object]]:
+        """
+        Extract (url, result) pairs for every individual file of the given results.
+        
+        URLs already in seen_urls (shared across calls, e.g. search pages) are skipped,
+        so a file listed by overlapping granule records is only downloaded once.
+        """
+        if seen_urls is None:
+            seen_urls = set()
+        file_urls = []
+        for result in results:
+            try:
+                # Get the data URLs from the earthaccess result object (built once)
+                urls = result.data_links() if hasattr(result, 'data_links') else None
+                if not urls and hasattr(result, 'data') and result.data:
+                    urls = result.data if isinstance(result.data, list) else [result.data]
+                if not urls:
+                    continue
+                
+                # Add all URLs from this granule
+                for url in urls:
+                    url = str(url)
+                    if url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                    file_urls.append((url, result))  # Store URL and original result object
+                    
+            except Exception as e:
+                self.logger.warning(f"Warning: Could not extract URLs from result: {e}")
+                continue
+        return file_urls
+    
+    def _filter_by_bands(self, file_urls, bands: List[str]) -> List[Tuple[str, object]]:
+        """Keep only the (url, result) pairs whose filename contains one of the bands."""
+        # One alternation matches all bands in a single scan of each filename
+        band_re = re.compile(r'\.(?:' + '|'.join(map(re.escape, bands)) + r')\.')
+        return [(url, result) for url, result in file_urls
+                if band_re.search(_basename(url))]
+    
     def _extract_granule_id(self, result) -> str:
         """
         Extract granule identifier from search result.
@@ -72,103 +668,349 @@ class HLSDownloader:
         HLS granule names follow pattern: HLS.S30.T42UXB.2025188T061639.v2.0.B11.tif
         Granule ID is everything except the band: HLS.S30.T42UXB.2025188T061639.v2.0
         """
+        cached = self._granule_ids.get(id(result))
+        if cached is not None and cached[0] is result:
+            return cached[1]
+        
         try:
+            # CMR records carry the granule name directly; no need to build the data links
+            granule_ur = result.get('umm', {}).get('GranuleUR') if isinstance(result, dict) else None
+            if granule_ur:
+                first_url = granule_ur
             # Get the data URLs from the earthaccess result object
-            if hasattr(result, 'data_links') and result.data_links():
+            elif hasattr(result, 'data_links') and result.data_links():
                 # Use the first data link to extract granule ID
                 first_url = result.data_links()[0]
             elif hasattr(result, 'data') and result.data:
                 # Alternative way to access data URLs
                 first_url = result.data[0] if isinstance(result.data, list) else str(result.data)
             else:
-                # Fallback: try to get URLs from the result object
-                first_url = str(result)
+                # No name to go by; derive a stable one so reruns land in the same folder
+                first_url = _fallback_granule_id(result)
             
             # Extract filename from URL
-            if 'http' in first_url:
+            if first_url.startswith(('http://', 'https://')):
                 # Extract filename from URL path
-                filename = first_url.split('/')[-1]
+                filename = _basename(first_url)
             else:
                 filename = first_url
             
-            # Remove .tif extension if present
-            if filename.endswith('.tif'):
-                filename = filename[:-4]
-            
-            # Split by dots and remove the last part (band identifier)
-            parts = filename.split('.')
-            if len(parts) >= 2:
-                # Check if last part looks like a band (B02, B03, etc.) or other identifier
-                last_part = parts[-1]
-                if (last_part.startswith('B') and len(last_part) <= 4) or last_part in ['Fmask', 'VAA', 'VZA', 'SAA', 'SZA']:
-                    # Remove the band/mask identifier
-                    granule_id = '.'.join(parts[:-1])
-                else:
-                    # Keep all parts if last part doesn't look like a band
-                    granule_id = filename
-            else:
-                granule_id = filename
-                
+            granule_id = _granule_id_from_filename(filename)
+            # Keep the result alive alongside its ID so the id() key cannot be reused
+            self._granule_ids[id(result)] = (result, granule_id)
             return granule_id
             
         except Exception as e:
             self.logger.warning(f"Warning: Could not extract granule ID from result: {e}")
-            # Fallback to using string representation
-            return f"unknown_granule_{hash(str(result)) % 10000}"
+            return _fallback_granule_id(result)
     
     def _group_results_by_granule(self, results) -> Dict[str, List]:
         """Group search results by granule identifier."""
-        granule_groups = defaultdict(list)
+        granule_groups = {}
         
         for result in results:
             granule_id = self._extract_granule_id(result)
-            granule_groups[granule_id].append(result)
+            granule_groups.setdefault(granule_id, []).append(result)
         
-        return dict(granule_groups)
+        return granule_groups
     
     def _group_file_urls_by_granule(self, file_urls) -> Dict[str, List]:
         """Group file URLs by granule identifier."""
-        granule_groups = defaultdict(list)
+        granule_groups = {}
         
         for url, result in file_urls:
-            # Extract granule ID from the filename in the URL
-            filename = url.split('/')[-1] if 'http' in url else url
+            # Every file of a result belongs to the same granule: reuse the ID computed
+            # (and cached) per result instead of parsing each file name again
+            granule_id = self._extract_granule_id(result)
+            granule_groups.setdefault(granule_id, []).append((url, result))
+        
+        return granule_groups
+    
+    def _remote_size(self, url: str) -> Optional[int]:
+        """Return the remote file size from a HEAD request, or None if unavailable."""
+        try:
+            response = self._http.head(url, allow_redirects=True, timeout=10)
+            response.raise_for_status()
+            return int(response.headers['Content-Length'])
+        except Exception as e:
+            self.logger.debug(f"Could not get remote size for {url}: {e}")
+            return None
+    
+    def _direct_s3_links(self, results) -> Dict[str, str]:
+        """Map filename -> s3:// link for the given search results."""
+        s3_links = {}
+        for result in results:
+            for link in result.data_links(access='direct'):
+                s3_links[_basename(link)] = link
+        return s3_links
+    
+    def _download_direct_s3(self, fs, url: str, s3_links: Dict[str, str], directory: str) -> str:
+        """Fetch one file into directory straight from S3 (in-region only) with the s3fs filesystem fs."""
+        filename = _basename(url)
+        if filename not in s3_links:
+            raise ValueError(f"No direct S3 link for {filename}")
+        path = os.path.join(directory, filename)
+        # Write under a temporary name so an interrupted transfer never looks complete
+        part_path = path + '.part'
+        try:
+            fs.get(s3_links[filename], part_path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        os.replace(part_path, path)
+        _drop_page_cache(path)
+        return path
+    
+    def _download_file(self, url: str, directory: str, progress=None) -> str:
+        """
+        Stream one file into directory over the shared session, in 4 MiB chunks.
+        
+        progress, if given, is called as progress(added_total, transferred) with the
+        file's announced size once and with the size of every chunk written.
+        """
+        path = os.path.join(directory, _basename(url))
+        # Write under a temporary name so an interrupted download never looks complete
+        part_path = path + '.part'
+        try:
+            with self._http.get(url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                size = int(response.headers.get('Content-Length') or 0)
+                if progress is not None:
+                    progress(size, 0)
+                # Copy straight from the socket stream (still undoing any transfer encoding)
+                response.raw.decode_content = True
+                with open(part_path, 'wb') as f:
+                    while True:
+                        chunk = response.raw.read(DOWNLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        if progress is not None:
+                            progress(0, len(chunk))
+                    # Evict through the descriptor we wrote with, no reopen by path
+                    f.flush()
+                    _drop_page_cache(f.fileno())
+            os.replace(part_path, path)
+        except BaseException:
+            # A failed or interrupted transfer leaves no partial file behind
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        return path
+    
+    def _download_via_cache(
+        self,
+        jobs: List[Tuple[str, str]],
+        s3_links: Optional[Dict[str, str]] = None,
+        force: bool = False
+    ) -> Dict[str, List[str]]:
+        """
+        Download (url, folder) jobs through the shared cache and hardlink them into place.
+        
+        Files are stored once under $HLS_CACHE by filename, so granules requested by
+        several projects (overlapping areas, adjacent dates) are only fetched once.
+        Folders on another filesystem than the cache (where a hardlink is impossible),
+        or every folder when HLS_CACHE is empty, get their files downloaded directly
+        instead, so no file is ever stored twice. A sidecar lockfile per file keeps
+        concurrent workers from racing.
+        All missing files are fetched as one batch, at most HLS_MAX_CONCURRENT_DOWNLOADS
+        (default 5) at a time. When s3_links is given (in-region), they are read directly from S3.
+        
+        Files recorded in their folder's manifest with a matching size are skipped
+        without any request, so re-runs after a partial failure only fetch what is
+        left. force ignores the manifests and the cache and downloads everything again.
+        
+        Returns:
+            Linked file paths per destination folder; files that failed are logged and left out
+        """
+        manifests = {folder: {} if force else _read_manifest(folder) for url, folder in jobs}
+        done = set()
+        for url, folder in jobs:
+            filename = _basename(url)
+            entry = manifests[folder].get(filename)
+            dest = os.path.join(folder, filename)
+            if entry and os.path.exists(dest) and os.path.getsize(dest) == entry.get('size'):
+                done.add((url, folder))
+        if done:
+            self.logger.info(f"   ⏭️  {len(done)} files already downloaded, skipping")
+        pending_jobs = [job for job in jobs if job not in done]
+        
+        max_workers = _max_concurrent_downloads()
+        cache_dir = _cache_dir()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        # Where each file is downloaded to: the cache, or the folder itself when the
+        # cache is off or cannot be hardlinked into it
+        store_dirs = {}
+        for url, folder in pending_jobs:
+            if folder not in store_dirs:
+                use_cache = cache_dir is not None and _same_filesystem(cache_dir, folder)
+                store_dirs[folder] = cache_dir if use_cache else folder
+        # Where each job's file is stored; jobs sharing a path (the same file for several
+        # folders, or different URLs with one filename) fetch and lock it once, from the
+        # first URL that asked for it
+        job_paths = {(url, folder): os.path.join(store_dirs[folder], _basename(url)) for url, folder in pending_jobs}
+        sources = {}
+        for (url, folder), cache_path in job_paths.items():
+            sources.setdefault(cache_path, url)
+        # Files stored in their own folder may predate the .part download (no manifest)
+        in_folder = {cache_path for (url, folder), cache_path in job_paths.items() if store_dirs[folder] == folder}
+        # Where each stored file ends up being read from (an adopted folder copy when
+        # it cannot be hardlinked into the cache)
+        stored_paths = {cache_path: cache_path for cache_path in sources}
+        
+        with ExitStack() as locks:
+            # Lock in sorted order so overlapping batches cannot deadlock
+            for cache_path in sorted(sources):
+                locks.enter_context(_file_lock(cache_path + '.lock'))
+            
+            if force:
+                for cache_path in sources:
+                    if os.path.exists(cache_path):
+                        os.remove(cache_path)
+            
+            # Files already in their granule folder but not in the cache (downloaded before
+            # the cache or manifest existed) can be adopted if they are complete
+            adoptable = {}
+            if not force:
+                for (url, folder), cache_path in job_paths.items():
+                    dest = os.path.join(folder, _basename(url))
+                    if not os.path.exists(cache_path) and os.path.exists(dest):
+                        adoptable.setdefault(cache_path, dest)
+            
+            # Validate cached copies and adoptable files against the remote sizes,
+            # HEADs issued concurrently
+            head_paths = [cache_path for cache_path in sources if os.path.exists(cache_path)] + list(adoptable)
+            expected_sizes = {}
+            if head_paths:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(head_paths))) as pool:
+                    head_sizes = pool.map(self._remote_size, [sources[cache_path] for cache_path in head_paths])
+                    expected_sizes = dict(zip(head_paths, head_sizes))
             
-            # Remove .tif extension if present
-            if filename.endswith('.tif'):
-                filename = filename[:-4]
+            for cache_path, dest in adoptable.items():
+                # Unlike cached copies, an unverifiable size (HEAD failed) means re-download
+                if expected_sizes[cache_path] is not None and os.path.getsize(dest) == expected_sizes[cache_path]:
+                    try:
+                        os.link(dest, cache_path)
+                    except OSError:
+                        # No hardlink support: keep using the folder's copy as it is
+                        stored_paths[cache_path] = dest
             
-            # Split by dots and remove the last part (band identifier)
-            parts = filename.split('.')
-            if len(parts) >= 2:
-                # Check if last part looks like a band or other identifier
-                last_part = parts[-1]
-                if (last_part.startswith('B') and len(last_part) <= 4) or last_part in ['Fmask', 'VAA', 'VZA', 'SAA', 'SZA']:
-                    # Remove the band/mask identifier
-                    granule_id = '.'.join(parts[:-1])
+            missing_paths = []
+            for cache_path, stored_path in stored_paths.items():
+                if os.path.exists(stored_path):
+                    expected_size = expected_sizes[cache_path]
+                    if os.path.getsize(stored_path) == expected_size:
+                        continue
+                    # Only complete files are ever renamed into the cache, so a cached copy
+                    # is trusted when its size cannot be checked; a folder's file is not
+                    if expected_size is None and cache_path not in in_folder:
+                        continue
+                    # Partial or stale copy
+                    os.remove(stored_path)
+                    stored_paths[cache_path] = cache_path
+                missing_paths.append(cache_path)
+            
+            cached_count = len(sources) - len(missing_paths)
+            if cached_count:
+                self.logger.info(f"   ♻️  {cached_count} files already downloaded ({cache_dir or 'cache off'})")
+            
+            failed_paths = set()
+            if missing_paths and s3_links:
+                import earthaccess
+                
+                try:
+                    # One filesystem (and one set of temporary S3 credentials) for the batch
+                    fs = earthaccess.get_s3_filesystem(provider='LPCLOUD')
+                except Exception as e:
+                    self.logger.error(f"   ❌ Could not open S3 access: {e}")
+                    failed_paths.update(missing_paths)
                 else:
-                    # Keep all parts if last part doesn't look like a band
-                    granule_id = filename
-            else:
-                granule_id = filename
+                    with ThreadPoolExecutor(max_workers=min(max_workers, len(missing_paths))) as pool:
+                        futures = {pool.submit(self._download_direct_s3, fs, sources[cache_path], s3_links,
+                                               os.path.dirname(cache_path)): cache_path
+                                   for cache_path in missing_paths}
+                        for future in as_completed(futures):
+                            cache_path = futures[future]
+                            try:
+                                future.result()
+                            except Exception as e:
+                                # One failed file does not abort the rest of the batch
+                                self.logger.error(f"   ❌ Error downloading {os.path.basename(cache_path)}: {e}")
+                                failed_paths.add(cache_path)
+            elif missing_paths:
+                from tqdm import tqdm
+                
+                # One byte-level bar for the whole batch (off when not on a terminal);
+                # its total grows as each transfer announces its size
+                progress_bar = tqdm(total=0, unit='B', unit_scale=True, unit_divisor=1024,
+                                    desc='   Downloading', position=0, leave=True, disable=None)
+                progress_lock = threading.Lock()
+                
+                def progress(added_total: int, transferred: int) -> None:
+                    with progress_lock:
+                        if added_total:
+                            progress_bar.total += added_total
+                            progress_bar.refresh()
+                        if transferred:
+                            progress_bar.update(transferred)
+                
+                with progress_bar, ThreadPoolExecutor(max_workers=min(max_workers, len(missing_paths))) as pool:
+                    futures = {pool.submit(self._download_file, sources[cache_path], os.path.dirname(cache_path), progress): cache_path
+                               for cache_path in missing_paths}
+                    for future in as_completed(futures):
+                        cache_path = futures[future]
+                        try:
+                            future.result()
+                        except Exception as e:
+                            # One failed file does not abort the rest of the batch
+                            self.logger.error(f"   ❌ Error downloading {os.path.basename(cache_path)}: {e}")
+                            failed_paths.add(cache_path)
             
-            granule_groups[granule_id].append((url, result))
+            linked_files = {}
+            for url, folder in jobs:
+                if (url, folder) in done:
+                    linked_files.setdefault(folder, []).append(os.path.join(folder, _basename(url)))
+                elif job_paths[(url, folder)] not in failed_paths:
+                    dest = _link_into(stored_paths[job_paths[(url, folder)]], folder)
+                    manifests[folder][os.path.basename(dest)] = {'size': os.path.getsize(dest)}
+                    linked_files.setdefault(folder, []).append(dest)
         
-        return dict(granule_groups)
+        for folder, entries in manifests.items():
+            try:
+                _write_manifest(folder, entries)
+            except OSError as e:
+                self.logger.debug(f"Could not write download manifest in {folder}: {e}")
+        
+        if cache_dir is not None:
+            try:
+                pruned = _prune_cache(cache_dir)
+                if pruned:
+                    self.logger.info(f"   🧹 Removed {pruned} cached files no longer used by any folder")
+            except OSError as e:
+                self.logger.debug(f"Could not prune the download cache {cache_dir}: {e}")
+        return linked_files
     
     def _select_granules_interactive(self, granule_groups: Dict[str, List]) -> List[str]:
         """Allow user to interactively select granules."""
         granule_ids = list(granule_groups.keys())
         
-        print(f"\n🔍 Found {len(granule_ids)} granules:")
-        for i, granule_id in enumerate(granule_ids, 1):
-            file_count = len(granule_groups[granule_id])
-            print(f"   {i}. {granule_id} ({file_count} files)")
+        if len(granule_ids) == 1:
+            # Nothing to choose between
+            self.logger.info(f"\n🔍 Only one granule found; selecting it automatically: {granule_ids[0]}")
+            return granule_ids
         
-        print(f"\nOptions:")
-        print(f"   - Enter granule numbers (1-{len(granule_ids)}) separated by commas to select specific granules")
-        print(f"   - Press Enter to download all granules")
-        print(f"   - Type 'abort' to cancel")
+        # The menu is part of the prompt, not a log message: printed whatever LOGLEVEL
+        # says, as one write so it is never interleaved
+        listing = "\n".join(f"   {i}. {granule_id} ({len(granule_groups[granule_id])} files)"
+                            for i, granule_id in enumerate(granule_ids, 1))
+        print(f"\n🔍 Found {len(granule_ids)} granules:\n{listing}\n"
+              f"\nOptions:\n"
+              f"   - Enter granule numbers (1-{len(granule_ids)}) separated by commas to select specific granules\n"
+              f"     (ranges like 1-3 are accepted)\n"
+              f"   - Press Enter to download all granules\n"
+              f"   - Type 'abort' to cancel")
         
         while True:
             try:
@@ -182,18 +1024,12 @@ class HLSDownloader:
                     # Download all granules
                     return granule_ids
                 
-                # Parse selected numbers
-                selected_numbers = [int(x.strip()) for x in selection.split(',')]
-                
-                # Validate numbers
-                if all(1 <= num <= len(granule_ids) for num in selected_numbers):
-                    selected_granules = [granule_ids[num - 1] for num in selected_numbers]
-                    return selected_granules
-                else:
-                    print(f"❌ Invalid selection. Please enter numbers between 1 and {len(granule_ids)}")
+                # Parse and validate selected numbers and ranges ("1,3" or "1-3")
+                selected_numbers = _parse_selection(selection, len(granule_ids))
+                return [granule_ids[num - 1] for num in selected_numbers]
                     
-            except ValueError:
-                print("❌ Invalid input. Please enter numbers separated by commas or press Enter for all")
+            except ValueError as e:
+                print(f"❌ {e}")
             except KeyboardInterrupt:
                 print("\n❌ Download aborted by user")
                 return []
@@ -202,12 +1038,13 @@ class HLSDownloader:
         self,
         sw_coords: Tuple[float, float],
         ne_coords: Tuple[float, float], 
-        date: str,
+        date: Union[str, List[str]],
         bands: List[str],
         output_dir: str = "./data",
         max_results: int = 50,
         auto_download: bool = False,
-        cloud_cover: Tuple[float, float] = (0.0, 0.1)
+        cloud_cover: Tuple[float, float] = (0.0, 0.1),
+        force: bool = False
     ) -> List[str]:
         """
         Enhanced download method with better error handling and logging.
@@ -215,33 +1052,49 @@ class HLSDownloader:
         Args:
             sw_coords: Southwest coordinates (lat, lon)
             ne_coords: Northeast coordinates (lat, lon)
-            date: Date in YYYY-MM-DD format or date range
+            date: Date in YYYY-MM-DD format, date range, or list of dates
             bands: List of bands to download
             output_dir: Output directory for downloaded files
             max_results: Maximum number of search results
             auto_download: If True, automatically download the first granule
             cloud_cover: Cloud cover range as (min, max) fraction (default: (0.0, 0.3))
+            force: Re-download files even if they were already downloaded
         
         Returns:
             List of downloaded file paths
         """
+        try:
+            return self._download(sw_coords, ne_coords, date, bands, output_dir, max_results,
+                                  auto_download, cloud_cover, force)
+        except Exception as e:
+            self.logger.error(f"❌ Error during search/download: {e}")
+            self.logger.error(f"   Exception type: {type(e).__name__}")
+            import traceback
+            self.logger.debug(f"   Full traceback: {traceback.format_exc()}")
+            return []
+    
+    def _download(
+        self,
+        sw_coords: Tuple[float, float],
+        ne_coords: Tuple[float, float],
+        date: Union[str, List[str]],
+        bands: List[str],
+        output_dir: str = "./data",
+        max_results: int = 50,
+        auto_download: bool = False,
+        cloud_cover: Tuple[float, float] = (0.0, 0.1),
+        force: bool = False
+    ) -> List[str]:
+        """
+        download_hls_data without its catch-all error handling: authentication, search
+        and network errors propagate to the caller (e.g. serve(), which reports them).
+        """
         
-        # Create bounding box (west, south, east, north)
-        bounding_box = (
-            min(sw_coords[1], ne_coords[1]),  # west (min longitude)
-            min(sw_coords[0], ne_coords[0]),  # south (min latitude)
-            max(sw_coords[1], ne_coords[1]),  # east (max longitude)
-            max(sw_coords[0], ne_coords[0])   # north (max latitude)
-        )
+        # Granule IDs are cached per result object for the duration of one call
+        self._granule_ids.clear()
         
-        # Parse date parameter
-        if ',' in date:
-            # Date range provided
-            start_date, end_date = date.split(',')
-            temporal = (start_date.strip(), end_date.strip())
-        else:
-            # Single date provided, search for that day
-            temporal = (date, date)
+        # Bounding box (west, south, east, north) and date range
+        bounding_box, temporal, wanted_dates = self._search_window(sw_coords, ne_coords, date)
         
         self.logger.info(f"🔍 Searching NASA Earthdata for HLS Sentinel-2 data...")
         self.logger.info(f"   Bounding box: {bounding_box}")
@@ -249,145 +1102,133 @@ class HLSDownloader:
         self.logger.info(f"   Bands: {bands}")
         self.logger.info(f"   Cloud cover range: {cloud_cover[0]:.1f} - {cloud_cover[1]:.1f}")
         
-        try:
-            # Search for HLS Sentinel-2 data
-            # Pass cloud cover as separate min and max parameters
-            results = earthaccess.search_data(
-                short_name='HLSS30',  # HLS Sentinel-2 short name
-                bounding_box=bounding_box,
-                temporal=temporal,
-                cloud_cover=(cloud_cover[0], cloud_cover[1]),
-                count=max_results
-            )
-            
-            self.logger.info(f"📊 Found {len(results)} granule objects")
-            
-            if not results:
-                self.logger.error("❌ No data found for the specified criteria")
-                self.logger.error(f"   Search parameters:")
-                self.logger.error(f"   - Bounding box: {bounding_box}")
-                self.logger.error(f"   - Date range: {temporal}")
-                self.logger.error(f"   - Cloud cover: {cloud_cover[0]:.1f} - {cloud_cover[1]:.1f}")
-                self.logger.error(f"   - Bands: {bands}")
-                self.logger.error("💡 Suggestions:")
-                self.logger.error("   - Try a larger bounding box")
-                self.logger.error("   - Try a different date range (historical dates work better)")
-                self.logger.error("   - Try relaxing cloud cover constraints")
-                self.logger.error("   - Check if the area has satellite coverage")
-                return []
-            
-            # Extract all individual file URLs from granule objects
-            all_file_urls = []
-            for result in results:
-                try:
-                    # Get the data URLs from the earthaccess result object
-                    if hasattr(result, 'data_links') and result.data_links():
-                        urls = result.data_links()
-                    elif hasattr(result, 'data') and result.data:
-                        urls = result.data if isinstance(result.data, list) else [result.data]
-                    else:
-                        continue
-                    
-                    # Add all URLs from this granule
-                    for url in urls:
-                        all_file_urls.append((str(url), result))  # Store URL and original result object
-                        
-                except Exception as e:
-                    self.logger.warning(f"Warning: Could not extract URLs from result: {e}")
-                    continue
-            
-            self.logger.info(f"📊 Total individual files available: {len(all_file_urls)}")
-            
-            # Filter individual files by bands if specified
-            if bands:
-                filtered_file_urls = []
-                for url, result in all_file_urls:
-                    filename = url.split('/')[-1] if 'http' in url else url
-                    for band in bands:
-                        if f".{band}." in filename:
-                            filtered_file_urls.append((url, result))
-                            break
-                
-                all_file_urls = filtered_file_urls
-                self.logger.info(f"📊 After band filtering: {len(all_file_urls)} files")
-            
-            if not all_file_urls:
-                self.logger.error("❌ No files found matching the specified bands")
-                return []
-            
-            # Group file URLs by granule
-            granule_groups = self._group_file_urls_by_granule(all_file_urls)
-            num_granules = len(granule_groups)
-            
-            self.logger.info(f"📊 Organized into {num_granules} granules")
-            
-            # Select granules to download
-            if auto_download:
-                # In auto-download mode, download only the first granule
-                selected_granule_ids = [list(granule_groups.keys())[0]]
-                self.logger.info(f"🤖 Auto-download mode: downloading first granule only ({selected_granule_ids[0]})")
-                if num_granules > 1:
-                    self.logger.info(f"   Found {num_granules} granules total, selecting the first one")
-            else:
-                # Interactive mode - keep the 3 granule limit for user safety
-                if num_granules > 3:
-                    self.logger.error(f"❌ Error: Found {num_granules} granules, but maximum allowed is 3 in interactive mode")
-                    self.logger.error("   Please narrow your search criteria (smaller area or date range)")
-                    self.logger.error("   Or use --auto-download to automatically select the first granule")
-                    return []
-                    
-                selected_granule_ids = self._select_granules_interactive(granule_groups)
-            
-            if not selected_granule_ids:
-                self.logger.error("❌ No granules selected for download")
-                return []
-            
-            # Create main output directory
-            os.makedirs(output_dir, exist_ok=True)
-            
-            all_downloaded_files = []
-            
-            # Download each selected granule to its own folder
-            for granule_id in selected_granule_ids:
-                granule_file_urls = granule_groups[granule_id]
-                
-                # Extract just the URLs for downloading
-                urls_to_download = [url for url, result in granule_file_urls]
-                
-                # Create granule-specific folder
-                granule_folder = os.path.join(output_dir, granule_id)
-                os.makedirs(granule_folder, exist_ok=True)
-                
-                self.logger.info(f"\n⬇️  Downloading granule: {granule_id}")
-                self.logger.info(f"   Files: {len(urls_to_download)}")
-                self.logger.info(f"   Folder: {granule_folder}")
-                
-                # Download files for this granule
-                try:
-                    downloaded_files = earthaccess.download(urls_to_download, granule_folder)
-                    all_downloaded_files.extend(downloaded_files)
-                    self.logger.info(f"   ✓ Downloaded {len(downloaded_files)} files")
-                except Exception as e:
-                    self.logger.error(f"   ❌ Error downloading granule {granule_id}: {e}")
+        # Search for HLS Sentinel-2 data
+        # Pass cloud cover as separate min and max parameters
+        # Separate dates are filtered from their whole span: read that in large pages
+        search_pages = self._iter_matching_pages(
+            AUTO_DOWNLOAD_PAGE_SIZE if auto_download else CMR_MAX_PAGE_SIZE if wanted_dates else max_results,
+            max_results,
+            wanted_dates,
+            short_name='HLSS30',  # HLS Sentinel-2 short name
+            bounding_box=bounding_box,
+            temporal=temporal,
+            cloud_cover=(cloud_cover[0], cloud_cover[1]),
+            count=max_results
+        )
+        
+        results = []
+        all_file_urls = []
+        seen_urls = set()
+        granule_ids = set()
+        for page in search_pages:
+            results.extend(page)
+            if not auto_download:
+                # Interactive mode allows at most 3 granules: once past that, keep
+                # counting them but skip extracting files that will never be used
+                granule_ids.update(self._extract_granule_id(result) for result in page)
+                if len(granule_ids) > 3:
                     continue
+            # Extract all individual file URLs from granule objects
+            page_file_urls = self._file_urls(page, seen_urls)
+            all_file_urls.extend(page_file_urls)
+            # Auto-download only takes the first granule: stop searching once one
+            # has files for the requested bands and start downloading right away
+            if auto_download and (not bands or self._filter_by_bands(page_file_urls, bands)):
+                search_pages.close()
+                break
+        
+        self.logger.info(f"📊 Found {len(results)} granule objects")
+        
+        if not results:
+            self.logger.error("❌ No data found for the specified criteria")
+            self.logger.error(f"   Search parameters:")
+            self.logger.error(f"   - Bounding box: {bounding_box}")
+            self.logger.error(f"   - Date range: {temporal}")
+            self.logger.error(f"   - Cloud cover: {cloud_cover[0]:.1f} - {cloud_cover[1]:.1f}")
+            self.logger.error(f"   - Bands: {bands}")
+            self.logger.error("💡 Suggestions:")
+            self.logger.error("   - Try a larger bounding box")
+            self.logger.error("   - Try a different date range (historical dates work better)")
+            self.logger.error("   - Try relaxing cloud cover constraints")
+            self.logger.error("   - Check if the area has satellite coverage")
+            return []
+        
+        if len(granule_ids) > 3:
+            self.logger.error(f"❌ Error: Found {len(granule_ids)} granules, but maximum allowed is 3 in interactive mode")
+            self.logger.error("   Please narrow your search criteria (smaller area or date range)")
+            self.logger.error("   Or use --auto-download to automatically select the first granule")
+            return []
+        
+        self.logger.info(f"📊 Total individual files available: {len(all_file_urls)}")
+        
+        # Filter individual files by bands if specified
+        if bands:
+            all_file_urls = self._filter_by_bands(all_file_urls, bands)
+            self.logger.info(f"📊 After band filtering: {len(all_file_urls)} files")
+        
+        if not all_file_urls:
+            self.logger.error("❌ No files found matching the specified bands")
+            return []
+        
+        # Group file URLs by granule
+        granule_groups = self._group_file_urls_by_granule(all_file_urls)
+        num_granules = len(granule_groups)
+        
+        self.logger.info(f"📊 Organized into {num_granules} granules")
+        
+        # Select granules to download
+        if auto_download:
+            # In auto-download mode, download only the first granule
+            selected_granule_ids = [next(iter(granule_groups))]
+            self.logger.info(f"🤖 Auto-download mode: downloading first granule only ({selected_granule_ids[0]})")
+            if num_granules > 1:
+                self.logger.info(f"   Found {num_granules} granules total, selecting the first one")
+        else:
+            # Interactive mode - the 3 granule limit was checked right after the search
+            selected_granule_ids = self._select_granules_interactive(granule_groups)
+        
+        if not selected_granule_ids:
+            self.logger.error("❌ No granules selected for download")
+            return []
+        
+        # Build every (url, granule folder) job up front, then fetch the files of all
+        # selected granules as one concurrent batch instead of granule by granule
+        download_jobs = []
+        for granule_id in selected_granule_ids:
+            granule_file_urls = granule_groups[granule_id]
             
-            self.logger.info(f"\n✓ Successfully downloaded {len(all_downloaded_files)} files total")
-            self.logger.info(f"📁 Files organized in {len(selected_granule_ids)} granule folders under: {output_dir}")
-            
-            return all_downloaded_files
+            # Create granule-specific folder (and the main output directory with it)
+            granule_folder = os.path.join(output_dir, granule_id)
+            Path(granule_folder).mkdir(parents=True, exist_ok=True)
             
-        except Exception as e:
-            self.logger.error(f"❌ Error during search/download: {e}")
-            self.logger.error(f"   Exception type: {type(e).__name__}")
-            import traceback
-            self.logger.debug(f"   Full traceback: {traceback.format_exc()}")
-            return []
+            self.logger.info(f"\n⬇️  Downloading granule: {granule_id}")
+            self.logger.info(f"   Files: {len(granule_file_urls)}")
+            self.logger.info(f"   Folder: {granule_folder}")
+            download_jobs.extend((url, granule_folder) for url, result in granule_file_urls)
+        
+        s3_links = None
+        if self.in_region:
+            s3_links = self._direct_s3_links(
+                result for granule_id in selected_granule_ids for url, result in granule_groups[granule_id]
+            )
+        downloaded_by_folder = self._download_via_cache(download_jobs, s3_links, force)
+        
+        all_downloaded_files = []
+        for granule_id in selected_granule_ids:
+            downloaded_files = downloaded_by_folder.get(os.path.join(output_dir, granule_id), [])
+            all_downloaded_files.extend(downloaded_files)
+            self.logger.info(f"   ✓ {granule_id}: downloaded {len(downloaded_files)}/{len(granule_groups[granule_id])} files")
+        
+        self.logger.info(f"\n✓ Successfully downloaded {len(all_downloaded_files)} files total")
+        self.logger.info(f"📁 Files organized in {len(selected_granule_ids)} granule folders under: {output_dir}")
+        
+        return all_downloaded_files
     
     def list_available_data(
         self,
         sw_coords: Tuple[float, float],
         ne_coords: Tuple[float, float],
-        date: str,
+        date: Union[str, List[str]],
         max_results: int = 10,
         cloud_cover: Tuple[float, float] = (0.0, 0.1)
     ):
@@ -397,47 +1238,60 @@ class HLSDownloader:
         Args:
             sw_coords: Southwest coordinates (lat, lon)
             ne_coords: Northeast coordinates (lat, lon)
-            date: Date in YYYY-MM-DD format or date range
+            date: Date in YYYY-MM-DD format, date range, or list of dates
             max_results: Maximum number of results to display
             cloud_cover: Cloud cover range as (min, max) fraction (default: (0.0, 0.3))
         """
+        try:
+            return self._list_available(sw_coords, ne_coords, date, max_results, cloud_cover)
+        except Exception as e:
+            self.logger.error(f"❌ Error during search: {e}")
+            return []
+    
+    def _list_available(
+        self,
+        sw_coords: Tuple[float, float],
+        ne_coords: Tuple[float, float],
+        date: Union[str, List[str]],
+        max_results: int = 10,
+        cloud_cover: Tuple[float, float] = (0.0, 0.1)
+    ):
+        """list_available_data without its catch-all error handling (search errors propagate)."""
         
-        # Create bounding box
-        bounding_box = (
-            min(sw_coords[1], ne_coords[1]),
-            min(sw_coords[0], ne_coords[0]),
-            max(sw_coords[1], ne_coords[1]),
-            max(sw_coords[0], ne_coords[0])
-        )
-        
-        # Parse date
-        if ',' in date:
-            start_date, end_date = date.split(',')
-            temporal = (start_date.strip(), end_date.strip())
-        else:
-            temporal = (date, date)
+        # Bounding box and date range, built the same way as for downloads
+        bounding_box, temporal, wanted_dates = self._search_window(sw_coords, ne_coords, date)
         
         self.logger.info(f"🔍 Listing available HLS Sentinel-2 data...")
         self.logger.info(f"   Bounding box: {bounding_box}")
         self.logger.info(f"   Date range: {temporal}")
         self.logger.info(f"   Cloud cover range: {cloud_cover[0]:.1f} - {cloud_cover[1]:.1f}")
         
-        try:
-            # Pass cloud cover as separate min and max parameters
-            results = earthaccess.search_data(
-                short_name='HLSS30',
-                bounding_box=bounding_box,
-                temporal=temporal,
-                cloud_cover=(cloud_cover[0], cloud_cover[1]),
-                count=max_results
-            )
-            
-            self.logger.info(f"\n📊 Found {len(results)} granules:")
-            for i, result in enumerate(results[:max_results], 1):
-                self.logger.info(f"   {i}. {result}")
-                
-        except Exception as e:
-            self.logger.error(f"❌ Error during search: {e}")
+        # Pass cloud cover as separate min and max parameters
+        search_pages = self._iter_matching_pages(
+            CMR_MAX_PAGE_SIZE if wanted_dates else max_results,
+            max_results,
+            wanted_dates,
+            short_name='HLSS30',
+            bounding_box=bounding_box,
+            temporal=temporal,
+            cloud_cover=(cloud_cover[0], cloud_cover[1]),
+            count=max_results
+        )
+        results = [result for page in search_pages for result in page]
+        
+        listing = "\n".join(f"   {i}. {result}" for i, result in enumerate(results, 1))
+        self.logger.info(f"\n📊 Found {len(results)} granules:\n{listing}")
+        
+        return results
+
+
+# Any line of a coordinates file that starts with a "sw" or "ne" corner label
+CORNER_LINE_RE = re.compile(r'^[ \t]*(?:sw|ne)[ \t].*$', re.MULTILINE)
+# A complete "<sw|ne> <lat>,<lon>" line, separated by any whitespace, nothing after it
+_COORD_NUMBER = r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+COORDS_LINE_RE = re.compile(
+    rf'[ \t]*(sw|ne)[ \t]+({_COORD_NUMBER})[ \t]*,[ \t]*({_COORD_NUMBER})[ \t]*'
+)
 
 
 def parse_coordinates_file(file_path: str) -> Tuple[Tuple[float, float], Tuple[float, float]]:
@@ -450,36 +1304,81 @@ def parse_coordinates_file(file_path: str) -> Tuple[Tuple[float, float], Tuple[f
     Returns:
         Tuple of (sw_coords, ne_coords)
     """
-    sw_coords = None
-    ne_coords = None
-    
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('sw '):
-                    # Parse southwest coordinates
-                    coords_str = line.replace('sw ', '')
-                    lat, lon = map(float, coords_str.split(','))
-                    sw_coords = (lat, lon)
-                elif line.startswith('ne '):
-                    # Parse northeast coordinates  
-                    coords_str = line.replace('ne ', '')
-                    lat, lon = map(float, coords_str.split(','))
-                    ne_coords = (lat, lon)
-        
-        if sw_coords is None or ne_coords is None:
+        text = Path(file_path).read_text()
+        corners = {}
+        for line in CORNER_LINE_RE.finditer(text):
+            match = COORDS_LINE_RE.fullmatch(line.group(0))
+            if not match:
+                raise ValueError(f"Malformed coordinates line: {line.group(0).strip()!r}")
+            # Later lines win, as when the file was read line by line
+            corners[match.group(1)] = (float(match.group(2)), float(match.group(3)))
+        
+        if 'sw' not in corners or 'ne' not in corners:
             raise ValueError("Could not find both sw and ne coordinates in file")
+        sw_coords, ne_coords = corners['sw'], corners['ne']
             
         return sw_coords, ne_coords
         
     except Exception as e:
-        print(f"❌ Error parsing coordinates file: {e}")
+        logger.error(f"❌ Error parsing coordinates file: {e}")
         raise
 
 
-def main():
-    """Enhanced main function with better error handling."""
+def serve(downloader: HLSDownloader, args: Optional[argparse.Namespace] = None,
+          requests_in=sys.stdin, responses_out=sys.stdout) -> None:
+    """
+    Answer JSON-line requests with one already-authenticated downloader.
+    
+    Each input line is an object with an optional "action" ("download", the default,
+    or "list") plus the keyword arguments of the matching HLSDownloader method, e.g.
+    {"sw_coords": [45.24, 78.44], "ne_coords": [45.29, 78.49], "date": "2024-07-15", "bands": ["B02"]}.
+    Each request gets one JSON line back: {"ok": true, "result": ...} or {"ok": false, "error": ...}.
+    Authentication, search and network errors, and downloads that fetched no file, are
+    reported as "ok": false (the full details are in the log).
+    Login and session setup are paid once instead of once per process.
+    Keys a request leaves out default to the command-line options in args (output
+    directory, max results, bands, cloud cover range, --force), when given.
+    """
+    for line in requests_in:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            action = request.pop('action', 'download')
+            if args is not None:
+                request.setdefault('max_results', args.max_results)
+                request.setdefault('cloud_cover', (args.cloud_cover_min, args.cloud_cover_max))
+                if action == 'download':
+                    request.setdefault('output_dir', args.output_dir)
+                    request.setdefault('bands', args.bands)
+                    request.setdefault('force', args.force)
+            for key in ('sw_coords', 'ne_coords', 'cloud_cover'):
+                if key in request:
+                    request[key] = tuple(request[key])
+            
+            if action == 'download':
+                # stdin carries requests, so granule selection can't be interactive
+                request['auto_download'] = True
+                # The non-catching variants, so failures are not reported as empty successes
+                result = downloader._download(**request)
+                if not result:
+                    raise RuntimeError("No files downloaded: no matching data, or every transfer failed")
+            elif action == 'list':
+                result = [granule['umm']['GranuleUR'] for granule in downloader._list_available(**request)]
+            else:
+                raise ValueError(f"Unknown action: {action}")
+            reply = {'ok': True, 'result': result}
+        except Exception as e:
+            reply = {'ok': False, 'error': str(e)}
+        
+        responses_out.write(json.dumps(reply, default=str) + '\n')
+        responses_out.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command-line parser for the downloader (kept separate so --help can be checked in-process)."""
     parser = argparse.ArgumentParser(
         description="Download HLS Sentinel-2 data from NASA Earthdata (Enhanced)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -494,16 +1393,22 @@ Examples:
   # Download data for a date range with automatic download (no user interaction)
   python download_hls_data.py --coords-file coords.txt --date "2025-01-01,2025-01-31" --bands B8A B11 B12 --auto-download
 
+  # Download several individual dates with one search
+  python download_hls_data.py --coords-file coords.txt --dates "2025-01-05,2025-01-12,2025-01-19" --auto-download
+
   # Download data with specific cloud cover range
   python download_hls_data.py --coords-file coords.txt --date 2025-01-15 --cloud-cover-min 0 --cloud-cover-max 20
 
   # List available data without downloading
   python download_hls_data.py --coords-file coords.txt --date 2025-01-15 --list-only
+
+  # Keep one authenticated process serving JSON-line requests from stdin
+  python download_hls_data.py --serve < requests.jsonl
         """
     )
     
     # Coordinate options (either file or direct input)
-    coord_group = parser.add_mutually_exclusive_group(required=True)
+    coord_group = parser.add_mutually_exclusive_group()
     coord_group.add_argument('--coords-file', help='Path to coordinates file (sw/ne format)')
     coord_group.add_argument('--coords-direct', nargs=4, type=float, metavar=('SW_LAT', 'SW_LON', 'NE_LAT', 'NE_LON'),
                            help='Direct coordinates: sw_lat sw_lon ne_lat ne_lon')
@@ -515,17 +1420,19 @@ Examples:
     parser.add_argument('--ne-lon', type=float, help='Northeast longitude')
     
     # Required parameters
-    parser.add_argument('--date', required=True, 
-                       help='Date (YYYY-MM-DD) or date range (YYYY-MM-DD,YYYY-MM-DD)')
+    date_group = parser.add_mutually_exclusive_group()
+    date_group.add_argument('--date',
+                       help='Date (YYYY-MM-DD) or date range (YYYY-MM-DD,YYYY-MM-DD); required unless --serve')
+    date_group.add_argument('--dates',
+                       help='Several individual dates (YYYY-MM-DD,YYYY-MM-DD,...), fetched with a single search')
     
     # Optional parameters
     parser.add_argument('--bands', nargs='+', default=['B02', 'B03', 'B04', 'B8A', 'B11', 'B12'],
                        help='Bands to download (default: B02 B03 B04 B8A B11 B12)')
+    # These two default from .env, which is only read once the arguments are parsed
     parser.add_argument('--output-dir', 
-                       default=os.getenv('DEFAULT_OUTPUT_DIR', './data/downloaded'), 
                        help='Output directory (default: ./data/downloaded or DEFAULT_OUTPUT_DIR from .env)')
     parser.add_argument('--max-results', type=int, 
-                       default=int(os.getenv('DEFAULT_MAX_RESULTS', '50')),
                        help='Maximum number of results (default: 50 or DEFAULT_MAX_RESULTS from .env)')
     parser.add_argument('--cloud-cover-min', type=float, default=0.0,
                        help='Minimum cloud cover fraction (0.0-1.0, default: 0.0)')
@@ -535,11 +1442,27 @@ Examples:
                        help='Only list available data, do not download')
     parser.add_argument('--auto-download', action='store_true',
                        help='Automatically download all granules without user interaction')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-download files even if they were already downloaded')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging for debugging')
-    
+    parser.add_argument('--serve', action='store_true',
+                       help='Authenticate once, then answer JSON-line requests from stdin (one JSON reply per line on stdout)')
+    return parser
+
+
+def main():
+    """Enhanced main function with better error handling."""
+    parser = build_parser()
     args = parser.parse_args()
     
+    # Load environment variables from .env file
+    load_dotenv()
+    if args.output_dir is None:
+        args.output_dir = os.getenv('DEFAULT_OUTPUT_DIR', './data/downloaded')
+    if args.max_results is None:
+        args.max_results = int(os.getenv('DEFAULT_MAX_RESULTS', '50'))
+    
     # Setup logging
     logger = setup_logging(args.verbose)
     
@@ -552,6 +1475,24 @@ Examples:
         logger.error("❌ Minimum cloud cover cannot be greater than maximum cloud cover")
         return 1
     
+    if args.serve:
+        try:
+            # stdin carries the requests, so a credentials prompt would consume them
+            downloader = HLSDownloader(verbose=args.verbose, interactive_login=False)
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize downloader: {e}")
+            return 1
+        serve(downloader, args)
+        return 0
+    
+    if not args.date and not args.dates:
+        parser.error("--date or --dates is required (unless --serve is used)")
+    date = args.dates.split(',') if args.dates else args.date
+    try:
+        HLSDownloader._temporal(date)
+    except ValueError as e:
+        parser.error(str(e))
+    
     cloud_cover = (args.cloud_cover_min, args.cloud_cover_max)
     
     # Parse coordinates
@@ -581,23 +1522,24 @@ Examples:
     
     # List or download data
     if args.list_only:
-        downloader.list_available_data(sw_coords, ne_coords, args.date, args.max_results, cloud_cover)
+        downloader.list_available_data(sw_coords, ne_coords, date, args.max_results, cloud_cover)
     else:
         downloaded_files = downloader.download_hls_data(
             sw_coords=sw_coords,
             ne_coords=ne_coords,
-            date=args.date,
+            date=date,
             bands=args.bands,
             output_dir=args.output_dir,
             max_results=args.max_results,
             auto_download=args.auto_download,
-            cloud_cover=cloud_cover
+            cloud_cover=cloud_cover,
+            force=args.force
         )
         
         if downloaded_files:
-            logger.info(f"\n✓ Downloaded {len(downloaded_files)} files:")
+            logger.info(f"\n✓ Downloaded {len(downloaded_files)} files")
             for file_path in downloaded_files:
-                logger.info(f"   {file_path}")
+                logger.debug(f"   {file_path}")
         else:
             logger.info("\n❌ No files were downloaded")
             return 1
@@ -6,168 +6,460 @@ This tests the core functions without requiring NASA Earthdata authentication.
 
 import sys
 import os
+import io
+import contextlib
+import importlib.util
+from functools import cache, lru_cache
+from importlib.metadata import version, PackageNotFoundError
 from pathlib import Path
+from typing import Callable, List
 
-# Add src to path so we can import our module
-sys.path.insert(0, str(Path(__file__).parent))
+# Paths are anchored on this file so the tests work from any working directory
+HERE = Path(__file__).resolve().parent
+REPO = HERE.parent
+COORDS = REPO / "data/sentinel/region-0/coordinates.txt"
+
+# Load our module straight from its file instead of putting src on sys.path;
+# registering it in sys.modules lets the tests below import from it as usual
+_spec = importlib.util.spec_from_file_location("download_hls_data", HERE / "download_hls_data.py")
+download_hls_data = importlib.util.module_from_spec(_spec)
+sys.modules["download_hls_data"] = download_hls_data
+_spec.loader.exec_module(download_hls_data)
 
 from download_hls_data import parse_coordinates_file
 
+# Result line prefixes
+_OK = "   ✅ "
+_FAIL = "   ❌ "
+
+# Packages the downloader needs at runtime
+PKGS = ("earthaccess", "numpy", "rasterio", "xarray")
+
+@cache
+def pkg_version(name: str) -> str:
+    """Installed version of a package, read from its metadata once per session."""
+    return version(name)
+
+# Tests run in the order they are defined; each one adds itself with @register
+_TESTS: List[Callable[[], bool]] = []
+
+def register(test):
+    """Add a test function to the suite run by main()."""
+    _TESTS.append(test)
+    return test
+
+@lru_cache(maxsize=8)
+def _cached_parse(path, mtime):
+    """Parse a coordinates file once per (path, mtime); a changed file gets a new key."""
+    return parse_coordinates_file(path)
+
+@register
+def test_imports():
+    """Test that all required packages are installed."""
+    print("🧪 Testing imports...")
+    
+    # Look the packages up without importing them: rasterio and xarray pull in
+    # GDAL/PROJ and dask at import time just to report a version
+    try:
+        for pkg in PKGS:
+            if importlib.util.find_spec(pkg) is None:
+                raise ImportError(f"No module named '{pkg}'")
+            print(f"{_OK}{pkg} {pkg_version(pkg)}")
+        
+        return True
+        
+    except (ImportError, PackageNotFoundError) as e:
+        print(f"{_FAIL}Import failed: {e}")
+        return False
+
+@register
 def test_coordinate_parsing():
     """Test that coordinate parsing works correctly."""
     print("🧪 Testing coordinate parsing...")
     
-    coords_file = "../data/sentinel/region-0/coordinates.txt"
+    try:
+        sw_coords, ne_coords = _cached_parse(str(COORDS), COORDS.stat().st_mtime)
+        
+        print("%sSouthwest coordinates: (%.5f, %.5f)" % (_OK, *sw_coords))
+        print("%sNortheast coordinates: (%.5f, %.5f)" % (_OK, *ne_coords))
+        
+        # Validate coordinates are reasonable: two numeric (lat, lon) pairs
+        import numpy as np
+        coords = np.asarray([sw_coords, ne_coords], dtype=np.float64)
+        assert coords.shape == (2, 2), f"Expected two (lat, lon) pairs, got shape {coords.shape}"
+        
+        # Check that coordinates are in expected ranges (Central Asia region):
+        # latitudes in 40-50, longitudes in 70-85, all in one vectorized comparison
+        lo = np.array([40, 70])
+        hi = np.array([50, 85])
+        assert np.all((coords >= lo) & (coords <= hi)), f"Coordinates out of range: {coords.tolist()}"
+        
+        print(_OK + "Coordinate validation passed")
+        return True
+        
+    except Exception as e:
+        print(f"{_FAIL}Coordinate parsing failed: {e}")
+        return False
+
+@register
+def test_bounding_box_calculation():
+    """Test bounding box calculation logic."""
+    print("🧪 Testing bounding box calculation...")
     
     try:
-        sw_coords, ne_coords = parse_coordinates_file(coords_file)
+        sw_coords = (45.24301, 78.44504)  # lat, lon
+        ne_coords = (45.2912, 78.49116)   # lat, lon
+        
+        # Exercise the script's own helper rather than a copy of its logic
+        from download_hls_data import HLSDownloader
+        bounding_box = HLSDownloader._bbox(sw_coords, ne_coords)
         
-        print(f"   ✅ Southwest coordinates: {sw_coords}")
-        print(f"   ✅ Northeast coordinates: {ne_coords}")
+        expected_box = (78.44504, 45.24301, 78.49116, 45.2912)  # west, south, east, north
         
-        # Validate coordinates are reasonable
-        assert isinstance(sw_coords, tuple) and len(sw_coords) == 2
-        assert isinstance(ne_coords, tuple) and len(ne_coords) == 2
-        assert all(isinstance(x, float) for x in sw_coords + ne_coords)
+        assert bounding_box == expected_box, f"Expected {expected_box}, got {bounding_box}"
+        # Corners given the other way round give the same box
+        assert HLSDownloader._bbox(ne_coords, sw_coords) == expected_box
         
-        # Check that coordinates are in expected ranges (Central Asia region)
-        lat_range = (40, 50)  # Latitude range for the region
-        lon_range = (70, 85)  # Longitude range for the region
+        print("%sBounding box: (%.5f, %.5f, %.5f, %.5f) (west, south, east, north)" % (_OK, *bounding_box))
+        return True
         
-        assert lat_range[0] <= sw_coords[0] <= lat_range[1], f"SW latitude {sw_coords[0]} out of range"
-        assert lat_range[0] <= ne_coords[0] <= lat_range[1], f"NE latitude {ne_coords[0]} out of range"
-        assert lon_range[0] <= sw_coords[1] <= lon_range[1], f"SW longitude {sw_coords[1]} out of range"
-        assert lon_range[0] <= ne_coords[1] <= lon_range[1], f"NE longitude {ne_coords[1]} out of range"
+    except Exception as e:
+        print(f"{_FAIL}Bounding box calculation failed: {e}")
+        return False
+
+@register
+def test_date_parsing():
+    """Test date parsing logic."""
+    print("🧪 Testing date parsing...")
+    
+    try:
+        # Exercise the script's own parser rather than a copy of its logic
+        from download_hls_data import HLSDownloader
         
-        print("   ✅ Coordinate validation passed")
+        # Single date, date range, and a range with spaces around the comma
+        cases = (
+            ("2024-07-15", ("2024-07-15", "2024-07-15")),
+            ("2024-07-01,2024-07-31", ("2024-07-01", "2024-07-31")),
+            ("2024-07-01, 2024-07-31", ("2024-07-01", "2024-07-31")),
+        )
+        for date, expected in cases:
+            temporal, _ = HLSDownloader._temporal(date)
+            assert temporal == expected, f"Date parsing failed for {date!r}: {temporal}"
+        
+        # Separate dates (--dates): searched over their whole span, then filtered to the set
+        temporal, wanted = HLSDownloader._temporal(["2024-07-20", " 2024-07-05", "2024-07-12"])
+        assert temporal == ("2024-07-05", "2024-07-20"), f"Date list span wrong: {temporal}"
+        assert wanted == {"2024-07-05", "2024-07-12", "2024-07-20"}, f"Date list set wrong: {wanted}"
+        assert HLSDownloader._temporal("2024-07-01,2024-07-31")[1] is None
+        
+        # Empty entries ("2024-07-15," or an empty list) and malformed dates are rejected
+        for dates in (["2024-07-15", ""], [" "], [], ["2024-7-5"], ["20240705"], ["2024-02-30"], ["2024-07-15T00:00"]):
+            try:
+                HLSDownloader._temporal(dates)
+            except ValueError:
+                continue
+            raise AssertionError(f"Date list {dates!r} should be rejected")
+        
+        print(_OK + "Date parsing works correctly")
         return True
         
     except Exception as e:
-        print(f"   ❌ Coordinate parsing failed: {e}")
+        print(f"{_FAIL}Date parsing failed: {e}")
         return False
 
-def test_imports():
-    """Test that all required imports work."""
-    print("🧪 Testing imports...")
+@register
+def test_selection_parsing():
+    """Test interactive granule selection parsing."""
+    print("🧪 Testing granule selection parsing...")
     
     try:
-        import earthaccess
-        print(f"   ✅ earthaccess {earthaccess.__version__}")
+        from download_hls_data import _parse_selection
         
-        import numpy as np
-        print(f"   ✅ numpy {np.__version__}")
+        # Selection, number of granules offered, expected 1-based numbers
+        cases = (
+            ("2", 3, [2]),
+            ("1,3", 3, [1, 3]),
+            ("1-3", 3, [1, 2, 3]),
+            (" 1 - 2 , 3", 3, [1, 2, 3]),
+            ("1,1", 3, [1]),
+            ("3,1-3", 3, [3, 1, 2]),
+        )
+        for selection, count, expected in cases:
+            numbers = _parse_selection(selection, count)
+            assert numbers == expected, f"Selection {selection!r} gave {numbers}, expected {expected}"
+        
+        # Reversed ranges, empty entries, words and out-of-range numbers are rejected
+        for selection in ("3-1", "1,,2", "1,", "a", "0", "4", "2-4", "1-2-3"):
+            try:
+                _parse_selection(selection, 3)
+            except ValueError:
+                continue
+            raise AssertionError(f"Selection {selection!r} should be rejected")
+        
+        print(_OK + "Granule selection parsing works correctly")
+        return True
+        
+    except Exception as e:
+        print(f"{_FAIL}Granule selection parsing failed: {e}")
+        return False
+
+@register
+def test_granule_id_extraction():
+    """Test granule IDs derived from file names."""
+    print("🧪 Testing granule ID extraction...")
+    
+    try:
+        from download_hls_data import _granule_id_from_filename
         
-        import rasterio
-        print(f"   ✅ rasterio {rasterio.__version__}")
+        granule = "HLS.S30.T42UXB.2025188T061639.v2.0"
+        cases = (
+            # Standard HLS names: everything but band and extension
+            (f"{granule}.B02.tif", granule),
+            (f"{granule}.B8A.tif", granule),
+            (f"{granule}.Fmask.tif", granule),
+            ("HLS.L30.T42UXB.2025188T061639.v2.0.B10.tif", "HLS.L30.T42UXB.2025188T061639.v2.0"),
+            (granule, granule),
+            # Non-HLS names: drop .tif and a trailing band identifier only
+            ("scene.B02.tif", "scene"),
+            ("scene.B02", "scene"),
+            ("scene.VAA.tif", "scene"),
+            ("scene.final.tif", "scene.final"),
+            ("B02.tif", "B02"),
+            (".B02", ".B02"),
+            ("unknown_granule_1a2b3c4d", "unknown_granule_1a2b3c4d"),
+        )
+        for filename, expected in cases:
+            granule_id = _granule_id_from_filename(filename)
+            assert granule_id == expected, f"{filename!r} gave {granule_id!r}, expected {expected!r}"
         
-        import xarray as xr
-        print(f"   ✅ xarray {xr.__version__}")
+        print(_OK + "Granule ID extraction works correctly")
+        return True
         
+    except Exception as e:
+        print(f"{_FAIL}Granule ID extraction failed: {e}")
+        return False
+
+@register
+def test_search_cache_ttl():
+    """Test how long cached searches are reused."""
+    print("🧪 Testing search cache lifetime...")
+    
+    try:
+        from datetime import date, timedelta
+        from download_hls_data import _search_cache_ttl, SEARCH_CACHE_TTL, SEARCH_CACHE_SETTLED_DAYS
+        
+        today = date.today()
+        settled = (today - timedelta(days=SEARCH_CACHE_SETTLED_DAYS + 1)).isoformat()
+        recent = (today - timedelta(days=SEARCH_CACHE_SETTLED_DAYS - 1)).isoformat()
+        cases = (
+            # Ranges that ended long ago never change: cached forever
+            (("2020-01-01", settled), None),
+            (("2020-01-01", settled + "T23:59:59Z"), None),
+            # Recent or unparseable ranges expire after SEARCH_CACHE_TTL
+            (("2020-01-01", recent), SEARCH_CACHE_TTL),
+            ((today.isoformat(), today.isoformat()), SEARCH_CACHE_TTL),
+            (("2020-01-01", "not a date"), SEARCH_CACHE_TTL),
+            (None, SEARCH_CACHE_TTL),
+        )
+        for temporal, expected in cases:
+            ttl = _search_cache_ttl(temporal)
+            assert ttl == expected, f"Range {temporal!r} gave {ttl}, expected {expected}"
+        
+        print(_OK + "Search cache lifetime works correctly")
         return True
         
-    except ImportError as e:
-        print(f"   ❌ Import failed: {e}")
+    except Exception as e:
+        print(f"{_FAIL}Search cache lifetime failed: {e}")
         return False
 
+@register
 def test_script_help():
     """Test that the script help works."""
     print("🧪 Testing script help...")
     
     try:
-        # Test that the script can show help without errors
-        import subprocess
-        result = subprocess.run([
-            sys.executable, "download_hls_data.py", "--help"
-        ], capture_output=True, text=True, cwd="src")
-        
-        if result.returncode == 0 and "Download HLS Sentinel-2 data" in result.stdout:
-            print("   ✅ Help command works")
+        # Build the help text in-process instead of starting a second interpreter
+        from download_hls_data import build_parser
+        help_text = build_parser().format_help()
+        
+        if "Download HLS Sentinel-2 data" in help_text:
+            print(_OK + "Help command works")
             return True
         else:
-            print(f"   ❌ Help command failed: {result.stderr}")
+            print(_FAIL + "Help command failed: unexpected help text")
             return False
             
     except Exception as e:
-        print(f"   ❌ Script help test failed: {e}")
+        print(f"{_FAIL}Script help test failed: {e}")
         return False
 
-def test_bounding_box_calculation():
-    """Test bounding box calculation logic."""
-    print("🧪 Testing bounding box calculation...")
+class _StubResponse:
+    """Just enough of a requests streaming response for the downloader."""
+    
+    def __init__(self, body: bytes):
+        self.headers = {"Content-Length": str(len(body))}
+        self.raw = io.BytesIO(body)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def raise_for_status(self):
+        pass
+
+class _StubSession:
+    """HTTP session serving a fixed body for every URL and counting GET requests."""
+    
+    def __init__(self, body: bytes = b"0123456789"):
+        self.body = body
+        self.gets = 0
+    
+    def get(self, url, **kwargs):
+        self.gets += 1
+        return _StubResponse(self.body)
+    
+    def head(self, url, **kwargs):
+        return _StubResponse(self.body)
+
+def _stub_downloader():
+    """An HLSDownloader that never logs in, downloading through a _StubSession."""
+    import logging
+    from download_hls_data import HLSDownloader
+    
+    downloader = HLSDownloader.__new__(HLSDownloader)
+    downloader.logger = logging.getLogger("test_hls_downloader")
+    downloader._http = _StubSession()
+    return downloader
+
+_GRANULE_URL = "https://data.lpdaac.earthdatacloud.nasa.gov/lp-prod-protected/HLSS30.020/{0}/{0}.{1}.tif"
+_GRANULE = "HLS.S30.T42UXB.2025188T061639.v2.0"
+
+def _jobs(folder: str):
+    """Two band files of one granule, as (url, folder) download jobs for folder."""
+    return [(_GRANULE_URL.format(_GRANULE, band), folder) for band in ("B02", "B03")]
+
+@register
+def test_download_cache():
+    """Test downloads through the shared cache, re-runs and --force."""
+    print("🧪 Testing download cache...")
     
     try:
-        sw_coords = (45.24301, 78.44504)  # lat, lon
-        ne_coords = (45.2912, 78.49116)   # lat, lon
-        
-        # This is the logic from the download_hls_data.py script
-        bounding_box = (
-            min(sw_coords[1], ne_coords[1]),  # west (min longitude)
-            min(sw_coords[0], ne_coords[0]),  # south (min latitude)
-            max(sw_coords[1], ne_coords[1]),  # east (max longitude)
-            max(sw_coords[0], ne_coords[0])   # north (max latitude)
-        )
+        import tempfile
+        from unittest import mock
         
-        expected_box = (78.44504, 45.24301, 78.49116, 45.2912)  # west, south, east, north
-        
-        assert bounding_box == expected_box, f"Expected {expected_box}, got {bounding_box}"
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, {"HLS_CACHE": os.path.join(tmp, "cache")}):
+            folder = os.path.join(tmp, "out", _GRANULE)
+            os.makedirs(folder)
+            downloader = _stub_downloader()
+            
+            linked = downloader._download_via_cache(_jobs(folder))[folder]
+            assert len(linked) == 2, f"Linked {linked}"
+            for path in linked:
+                # One copy on disk, linked from the cache and the folder
+                assert os.stat(path).st_nlink == 2, f"{path} is not hardlinked to the cache"
+                assert os.path.exists(os.path.join(tmp, "cache", os.path.basename(path)))
+            assert downloader._http.gets == 2, f"{downloader._http.gets} GETs for 2 files"
+            
+            # Re-run: both files are in the folder's manifest, nothing is fetched
+            linked = downloader._download_via_cache(_jobs(folder))[folder]
+            assert len(linked) == 2 and downloader._http.gets == 2, "Re-run fetched files again"
+            
+            # --force fetches everything again
+            linked = downloader._download_via_cache(_jobs(folder), force=True)[folder]
+            assert len(linked) == 2 and downloader._http.gets == 4, "--force did not fetch again"
         
-        print(f"   ✅ Bounding box: {bounding_box} (west, south, east, north)")
+        print(_OK + "Download cache works correctly")
         return True
         
     except Exception as e:
-        print(f"   ❌ Bounding box calculation failed: {e}")
+        print(f"{_FAIL}Download cache failed: {e}")
         return False
 
-def test_date_parsing():
-    """Test date parsing logic."""
-    print("🧪 Testing date parsing...")
+@register
+def test_download_cache_off():
+    """Test that HLS_CACHE= downloads straight into the folder."""
+    print("🧪 Testing download with the cache off...")
     
     try:
-        # Test single date
-        single_date = "2024-07-15"
-        if ',' in single_date:
-            start_date, end_date = single_date.split(',')
-            temporal = (start_date.strip(), end_date.strip())
-        else:
-            temporal = (single_date, single_date)
+        import tempfile
+        from unittest import mock
         
-        assert temporal == ("2024-07-15", "2024-07-15"), f"Single date parsing failed: {temporal}"
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, {"HLS_CACHE": ""}):
+            folder = os.path.join(tmp, "out", _GRANULE)
+            os.makedirs(folder)
+            
+            linked = _stub_downloader()._download_via_cache(_jobs(folder))[folder]
+            assert len(linked) == 2, f"Linked {linked}"
+            for path in linked:
+                assert os.path.dirname(path) == folder and os.stat(path).st_nlink == 1, f"{path} has another link"
+            assert not any(name.endswith((".part", ".lock")) for name in os.listdir(folder)), "Leftover files"
         
-        # Test date range
-        date_range = "2024-07-01,2024-07-31"
-        if ',' in date_range:
-            start_date, end_date = date_range.split(',')
-            temporal = (start_date.strip(), end_date.strip())
-        else:
-            temporal = (date_range, date_range)
+        print(_OK + "Download with the cache off works correctly")
+        return True
+        
+    except Exception as e:
+        print(f"{_FAIL}Download with the cache off failed: {e}")
+        return False
+
+@register
+def test_cache_pruning():
+    """Test that pruning only removes old cached files no folder links to."""
+    print("🧪 Testing cache pruning...")
+    
+    try:
+        import tempfile
+        import time
+        from download_hls_data import _prune_cache, CACHE_UNLINKED_TTL
         
-        assert temporal == ("2024-07-01", "2024-07-31"), f"Date range parsing failed: {temporal}"
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = os.path.join(tmp, "cache")
+            os.makedirs(cache_dir)
+            old = time.time() - CACHE_UNLINKED_TTL - 60
+            paths = {}
+            for name in ("linked.tif", "unlinked.tif", "recent.tif"):
+                paths[name] = os.path.join(cache_dir, name)
+                with open(paths[name], "wb") as f:
+                    f.write(b"x")
+                if name != "recent.tif":
+                    os.utime(paths[name], (old, old))
+            os.link(paths["linked.tif"], os.path.join(tmp, "linked.tif"))
+            
+            assert _prune_cache(cache_dir) == 1, "Expected exactly one file pruned"
+            remaining = sorted(os.listdir(cache_dir))
+            assert remaining == ["linked.tif", "recent.tif"], f"Left {remaining}"
         
-        print("   ✅ Date parsing works correctly")
+        print(_OK + "Cache pruning works correctly")
         return True
         
     except Exception as e:
-        print(f"   ❌ Date parsing failed: {e}")
+        print(f"{_FAIL}Cache pruning failed: {e}")
         return False
 
+# Registration is done; freeze the suite
+_TESTS = tuple(_TESTS)
+
+def _run(test):
+    """Run one test with its output collected and written out in a single write."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        ok = test()
+    sys.stdout.write(buf.getvalue())
+    return ok
+
 def main():
     """Run all tests."""
     print("HLS Downloader Test Suite")
     print("=" * 40)
     
-    tests = [
-        test_imports,
-        test_coordinate_parsing,
-        test_bounding_box_calculation,
-        test_date_parsing,
-        test_script_help
-    ]
+    tests = _TESTS
     
     passed = 0
     total = len(tests)
     
     for test in tests:
-        if test():
+        if _run(test):
             passed += 1
         print()  # Empty line between tests
     